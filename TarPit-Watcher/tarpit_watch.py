@@ -20,9 +20,8 @@ This tool is defensive monitoring only. Use it on systems you own or are authori
 
 Dependencies
 ------------
-- python3 (standard library; no pip deps)
-- conntrack (conntrack tool)
-- iproute2 (ss/ip)
+- python3 >= 3.10 (standard library; no pip deps)
+- conntrack (conntrack tool; only used as a fallback when ctnetlink can't be read directly)
 - docker (for container/port mapping; optional but recommended on T-Pot)
 
 Run
@@ -36,15 +35,24 @@ from __future__ import annotations
 import argparse
 import curses
 import datetime as _dt
+import functools
+import heapq
 import json
 import os
+import queue
 import re
 import signal
+import socket
+import struct
 import subprocess
+import textwrap
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 VERSION = "0.6.7"
 
@@ -55,6 +63,11 @@ DEFAULT_GRACE_S = 8.0
 DEFAULT_POLL_S = 1.0
 DEFAULT_TOPN = 10
 DEFAULT_HISTORY_N = 50
+PORT_ROWS = 6              # rows in the active / lifetime port lists
+SYS_SAMPLE_S = 0.5         # PC INFO metrics are re-read at most this often
+SESSION_POOL_MAX = 4096    # recycled Session objects kept for connection storms
+LISTEN_CACHE_TTL_S = 30.0  # listening sockets change on the order of minutes
+HOST_CACHE_TTL_S = 60.0    # host IPs / default route
 
 FALLBACK_WATCH_PORTS = [
     21, 22, 23, 25, 53, 80, 110, 111, 135, 139, 143, 443, 445,
@@ -69,15 +82,49 @@ FALLBACK_WATCH_PORTS = [
     64296, 64298, 64299, 64303, 64305,
 ]
 
-# conntrack -L output (common format)
-RE_CT = re.compile(
-    r"^tcp\s+\d+\s+(?P<timeout>\d+)\s+(?P<state>[A-Z_]+)\s+"
-    r"src=(?P<src>\d+\.\d+\.\d+\.\d+)\s+dst=(?P<dst>\d+\.\d+\.\d+\.\d+)\s+"
-    r"sport=(?P<sport>\d+)\s+dport=(?P<dport>\d+)\s+"
-    r"src=(?P<rsrc>\d+\.\d+\.\d+\.\d+)\s+dst=(?P<rdst>\d+\.\d+\.\d+\.\d+)\s+"
-    r"sport=(?P<rsport>\d+)\s+dport=(?P<rdport>\d+)"
+# conntrack -L output (common format):
+#   tcp 6 <timeout> <STATE> src= dst= sport= dport= [UNREPLIED] src= dst= sport= dport= [ASSURED] mark= use=
+# first src/dst/sport/dport run is the original tuple, second is the reply tuple
+CT_TUPLE_FIELDS = {b"src": 0, b"dst": 1, b"sport": 2, b"dport": 3}
+
+# ctnetlink (NETLINK_NETFILTER) constants, see linux/netfilter/nfnetlink_conntrack.h
+NETLINK_NETFILTER = 12
+NFNL_SUBSYS_CTNETLINK = 1
+IPCTNL_MSG_CT_GET = 1
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+NLA_TYPE_MASK = 0x3FFF  # strips NLA_F_NESTED / NLA_F_NET_BYTEORDER
+
+CTA_TUPLE_ORIG = 1
+CTA_TUPLE_REPLY = 2
+CTA_PROTOINFO = 4
+CTA_TIMEOUT = 7
+CTA_TUPLE_IP = 1
+CTA_TUPLE_PROTO = 2
+CTA_IP_V4_SRC = 1
+CTA_IP_V4_DST = 2
+CTA_PROTO_NUM = 1
+CTA_PROTO_SRC_PORT = 2
+CTA_PROTO_DST_PORT = 3
+CTA_PROTOINFO_TCP = 1
+CTA_PROTOINFO_TCP_STATE = 1
+
+# same names the conntrack tool prints
+CT_TCP_STATES = (
+    "NONE", "SYN_SENT", "SYN_RECV", "ESTABLISHED", "FIN_WAIT",
+    "CLOSE_WAIT", "LAST_ACK", "TIME_WAIT", "CLOSE", "LISTEN",
 )
 
+# netlink headers are host byte order; conntrack attribute payloads are network byte order
+_NLMSGHDR = struct.Struct("=IHHII")
+_NFGENMSG = struct.Struct("=BBH")
+_NLA = struct.Struct("=HH")
+_NLERR = struct.Struct("=i")
+_BE16 = struct.Struct("!H")
+_BE32 = struct.Struct("!I")
+
 # ------------------------- Themes -------------------------
 P_BORDER = 1
 P_TITLE  = 2
@@ -86,17 +133,39 @@ P_DIM    = 4
 P_WARN   = 5
 P_BAD    = 6
 
-THEMES = [
+# border, title, text, dim, warn, bad foregrounds (background is always the terminal default)
+_W, _R, _G, _Y = curses.COLOR_WHITE, curses.COLOR_RED, curses.COLOR_GREEN, curses.COLOR_YELLOW
+_B, _M, _C = curses.COLOR_BLUE, curses.COLOR_MAGENTA, curses.COLOR_CYAN
+THEME_TABLE: Dict[str, Tuple[int, int, int, int, int, int]] = {
     # 25 themes total (includes amber)
-    "amber", "matrix", "ocean", "ice", "violet",
-    "sunset", "mono", "classic", "forest", "neon",
-    "steel", "crimson", "cyan", "gold", "lava",
-    "mint", "plasma", "midnight", "desert", "emerald",
-    "slate", "royal", "retro", "hacker", "solar",
-]
-
-def _pair(fg: int, bg: int = -1) -> Tuple[int, int]:
-    return (fg, bg)
+    "amber":     (_Y, _Y, _W, _C, _Y, _R),
+    "matrix":    (_G, _G, _G, _C, _Y, _R),
+    "ocean":     (_C, _B, _W, _C, _Y, _R),
+    "ice":       (_C, _C, _W, _B, _Y, _R),
+    "violet":    (_M, _M, _W, _C, _Y, _R),
+    "sunset":    (_Y, _R, _W, _M, _Y, _R),
+    "mono":      (_W, _W, _W, _W, _W, _W),
+    "classic":   (_B, _B, _W, _C, _Y, _R),
+    "forest":    (_G, _G, _W, _Y, _Y, _R),
+    "neon":      (_C, _M, _W, _C, _Y, _R),
+    "steel":     (_B, _C, _W, _B, _Y, _R),
+    "crimson":   (_R, _R, _W, _M, _Y, _R),
+    "cyan":      (_C, _C, _W, _C, _Y, _R),
+    "gold":      (_Y, _Y, _W, _M, _Y, _R),
+    "lava":      (_R, _Y, _W, _R, _Y, _R),
+    "mint":      (_G, _C, _W, _G, _Y, _R),
+    "plasma":    (_M, _C, _W, _M, _Y, _R),
+    "midnight":  (_B, _B, _W, _C, _Y, _R),
+    "desert":    (_Y, _Y, _W, _R, _Y, _R),
+    "emerald":   (_G, _G, _W, _C, _Y, _R),
+    "slate":     (_W, _C, _W, _B, _Y, _R),
+    "royal":     (_M, _B, _W, _C, _Y, _R),
+    "retro":     (_G, _Y, _W, _G, _Y, _R),
+    "hacker":    (_G, _G, _W, _G, _Y, _R),
+    "solar":     (_Y, _C, _W, _B, _Y, _R),
+}
+THEMES = list(THEME_TABLE)
+THEME_PAIRS = (P_BORDER, P_TITLE, P_TEXT, P_DIM, P_WARN, P_BAD)
 
 def init_theme(theme: str) -> None:
     if not curses.has_colors():
@@ -104,89 +173,16 @@ def init_theme(theme: str) -> None:
     curses.start_color()
     curses.use_default_colors()
 
-    C_BLACK = curses.COLOR_BLACK
-    C_WHITE = curses.COLOR_WHITE
-    C_RED = curses.COLOR_RED
-    C_GREEN = curses.COLOR_GREEN
-    C_YELLOW = curses.COLOR_YELLOW
-    C_BLUE = curses.COLOR_BLUE
-    C_MAGENTA = curses.COLOR_MAGENTA
-    C_CYAN = curses.COLOR_CYAN
-
-    # defaults
-    border = _pair(C_YELLOW)
-    title  = _pair(C_YELLOW)
-    text   = _pair(C_WHITE)
-    dim    = _pair(C_CYAN)
-    warn   = _pair(C_YELLOW)
-    bad    = _pair(C_RED)
-
-    t = theme.lower().strip()
-
-    if t == "amber":
-        border, title, text, dim, warn, bad = _pair(C_YELLOW), _pair(C_YELLOW), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "matrix":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_GREEN), _pair(C_GREEN), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "ocean":
-        border, title, text, dim, warn, bad = _pair(C_CYAN), _pair(C_BLUE), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "ice":
-        border, title, text, dim, warn, bad = _pair(C_CYAN), _pair(C_CYAN), _pair(C_WHITE), _pair(C_BLUE), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "violet":
-        border, title, text, dim, warn, bad = _pair(C_MAGENTA), _pair(C_MAGENTA), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "sunset":
-        border, title, text, dim, warn, bad = _pair(C_YELLOW), _pair(C_RED), _pair(C_WHITE), _pair(C_MAGENTA), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "mono":
-        border, title, text, dim, warn, bad = _pair(C_WHITE), _pair(C_WHITE), _pair(C_WHITE), _pair(C_WHITE), _pair(C_WHITE), _pair(C_WHITE)
-    elif t == "classic":
-        border, title, text, dim, warn, bad = _pair(C_BLUE), _pair(C_BLUE), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "forest":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_GREEN), _pair(C_WHITE), _pair(C_YELLOW), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "neon":
-        border, title, text, dim, warn, bad = _pair(C_CYAN), _pair(C_MAGENTA), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "steel":
-        border, title, text, dim, warn, bad = _pair(C_BLUE), _pair(C_CYAN), _pair(C_WHITE), _pair(C_BLUE), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "crimson":
-        border, title, text, dim, warn, bad = _pair(C_RED), _pair(C_RED), _pair(C_WHITE), _pair(C_MAGENTA), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "cyan":
-        border, title, text, dim, warn, bad = _pair(C_CYAN), _pair(C_CYAN), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "gold":
-        border, title, text, dim, warn, bad = _pair(C_YELLOW), _pair(C_YELLOW), _pair(C_WHITE), _pair(C_MAGENTA), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "lava":
-        border, title, text, dim, warn, bad = _pair(C_RED), _pair(C_YELLOW), _pair(C_WHITE), _pair(C_RED), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "mint":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_CYAN), _pair(C_WHITE), _pair(C_GREEN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "plasma":
-        border, title, text, dim, warn, bad = _pair(C_MAGENTA), _pair(C_CYAN), _pair(C_WHITE), _pair(C_MAGENTA), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "midnight":
-        border, title, text, dim, warn, bad = _pair(C_BLUE), _pair(C_BLUE), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "desert":
-        border, title, text, dim, warn, bad = _pair(C_YELLOW), _pair(C_YELLOW), _pair(C_WHITE), _pair(C_RED), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "emerald":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_GREEN), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "slate":
-        border, title, text, dim, warn, bad = _pair(C_WHITE), _pair(C_CYAN), _pair(C_WHITE), _pair(C_BLUE), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "royal":
-        border, title, text, dim, warn, bad = _pair(C_MAGENTA), _pair(C_BLUE), _pair(C_WHITE), _pair(C_CYAN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "retro":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_YELLOW), _pair(C_WHITE), _pair(C_GREEN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "hacker":
-        border, title, text, dim, warn, bad = _pair(C_GREEN), _pair(C_GREEN), _pair(C_WHITE), _pair(C_GREEN), _pair(C_YELLOW), _pair(C_RED)
-    elif t == "solar":
-        border, title, text, dim, warn, bad = _pair(C_YELLOW), _pair(C_CYAN), _pair(C_WHITE), _pair(C_BLUE), _pair(C_YELLOW), _pair(C_RED)
-
-    curses.init_pair(P_BORDER, border[0], border[1])
-    curses.init_pair(P_TITLE,  title[0],  title[1])
-    curses.init_pair(P_TEXT,   text[0],   text[1])
-    curses.init_pair(P_DIM,    dim[0],    dim[1])
-    curses.init_pair(P_WARN,   warn[0],   warn[1])
-    curses.init_pair(P_BAD,    bad[0],    bad[1])
+    fgs = THEME_TABLE.get(theme.lower().strip(), THEME_TABLE["amber"])
+    for pid, fg in zip(THEME_PAIRS, fgs):
+        curses.init_pair(pid, fg, -1)
 
 # ------------------------- Utility -------------------------
 def _now_local() -> _dt.datetime:
     return _dt.datetime.now().astimezone()
 
-def _fmt_age(seconds: float) -> str:
-    seconds = max(0, int(seconds))
+def _fmt_age_calc(seconds: int) -> str:
+    seconds = max(0, seconds)
     if seconds < 60:
         return f"{seconds}s"
     m, s = divmod(seconds, 60)
@@ -198,19 +194,42 @@ def _fmt_age(seconds: float) -> str:
     d, remh = divmod(h, 24)
     return f"{d}d{remh:02}h"
 
-def _is_private_ipv4(ip: str) -> bool:
-    if ip.startswith("10."): return True
-    if ip.startswith("192.168."): return True
-    if ip.startswith("127."): return True
-    if ip.startswith("169.254."): return True
-    if ip.startswith("172."):
-        try:
-            x = int(ip.split(".")[1])
-            return 16 <= x <= 31
-        except Exception:
-            return False
+# every age under an hour, formatted once at import (~3600 short strings)
+_AGE_TABLE = tuple(_fmt_age_calc(i) for i in range(3600))
+
+def _fmt_age(seconds: float) -> str:
+    seconds = int(seconds)
+    if 0 <= seconds < 3600:
+        return _AGE_TABLE[seconds]
+    return _fmt_age_calc(seconds)
+
+# (network, mask): 10/8, 172.16/12, 192.168/16, 127/8, 169.254/16
+_PRIVATE_V4_NETS = (
+    (0x0A000000, 0xFF000000),
+    (0xAC100000, 0xFFF00000),
+    (0xC0A80000, 0xFFFF0000),
+    (0x7F000000, 0xFF000000),
+    (0xA9FE0000, 0xFFFF0000),
+)
+
+def _is_private_ipv4(ip_int: int) -> bool:
+    # ip_int is the address as a big-endian uint32 (see _ip4_int)
+    for net, mask in _PRIVATE_V4_NETS:
+        if (ip_int & mask) == net:
+            return True
     return False
 
+def _counter_dec(c: Counter, k) -> None:
+    # decrement and drop the key at zero so len()/most_common() stay exact
+    n = c[k] - 1
+    if n > 0:
+        c[k] = n
+    else:
+        c.pop(k, None)
+
+def _ip4_int(ip: str) -> int:
+    return int.from_bytes(socket.inet_aton(ip), "big")
+
 def _run(cmd: List[str], timeout: float = 6.0) -> Tuple[int, str, str]:
     try:
         p = subprocess.run(cmd, text=True, capture_output=True, timeout=timeout)
@@ -218,37 +237,55 @@ def _run(cmd: List[str], timeout: float = 6.0) -> Tuple[int, str, str]:
     except Exception as e:
         return 1, "", str(e)
 
-def _safe_add(stdscr, y: int, x: int, s: str, attr: int = 0) -> None:
+def _run_stream(cmd: List[str], timeout: float = 6.0) -> Iterator[bytes]:
+    # yields raw stdout lines as the command produces them; killed after timeout
     try:
-        H, W = stdscr.getmaxyx()
+        p = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    except OSError:
+        return
+    timer = threading.Timer(timeout, p.kill)
+    timer.daemon = True
+    timer.start()
+    try:
+        yield from p.stdout
+    finally:
+        timer.cancel()
+        p.stdout.close()
+        try:
+            p.wait(timeout=1.0)
+        except subprocess.TimeoutExpired:
+            p.kill()
+            p.wait()
+
+def _safe_add(stdscr, y: int, x: int, s: str, attr: int = 0, hw: Optional[Tuple[int,int]] = None) -> None:
+    # hw: (H, W) from the caller's getmaxyx(), for loops that draw many cells
+    try:
+        H, W = hw or stdscr.getmaxyx()
         if y < 0 or y >= H: return
         if x < 0 or x >= W: return
-        maxlen = max(0, W - x)
+        maxlen = W - x
         if maxlen <= 0: return
-        if len(s) > maxlen:
-            s = s[:maxlen]
-        stdscr.addstr(y, x, s, attr)
+        stdscr.addnstr(y, x, s, maxlen, attr)
     except curses.error:
         pass
 
 def _safe_hline(stdscr, y: int, x: int, n: int, ch: str, attr: int = 0) -> None:
+    # one addnstr of the whole run; stdscr.hline() can't take multi-byte box glyphs like "─"
     if n <= 0: return
-    try:
-        for i in range(n):
-            _safe_add(stdscr, y, x+i, ch, attr)
-    except curses.error:
-        pass
+    _safe_add(stdscr, y, x, ch * n, attr)
+
+_BYTE_UNITS = ("B", "KiB", "MiB", "GiB", "TiB", "PiB")
+_SMALL_BYTES = tuple(f"{i}B" for i in range(1024))
 
+@functools.lru_cache(maxsize=256)
 def _human_bytes(n: float) -> str:
-    n = float(n)
-    units = ["B", "KiB", "MiB", "GiB", "TiB"]
-    i = 0
-    while n >= 1024 and i < len(units)-1:
-        n /= 1024.0
-        i += 1
-    if i == 0:
-        return f"{int(n)}{units[i]}"
-    return f"{n:.1f}{units[i]}"
+    # mem/disk figures repeat from frame to frame; only net totals really miss
+    n = int(n)
+    if n < 1024:
+        return _SMALL_BYTES[n] if n >= 0 else f"{n}B"
+    # unit index straight from the bit length: [1024**i, 1024**(i+1)) -> i
+    i = min((n.bit_length() - 1) // 10, len(_BYTE_UNITS) - 1)
+    return f"{n / (1 << (10 * i)):.1f}{_BYTE_UNITS[i]}"
 
 def _human_rate_bytes_per_s(n: float) -> str:
     # show KiB/s plus Mbps-ish hint
@@ -256,12 +293,45 @@ def _human_rate_bytes_per_s(n: float) -> str:
     mbps = (n * 8) / 1_000_000.0
     return f"{kib:.1f} KiB/s ({mbps:.1f} Mbps)"
 
+_HOST_CACHE: Dict[str, Tuple[float, object]] = {}
+
+def _host_cached(name: str, fn):
+    now = time.monotonic()
+    hit = _HOST_CACHE.get(name)
+    if hit is not None and (now - hit[0]) < HOST_CACHE_TTL_S:
+        return hit[1]
+    val = fn()
+    _HOST_CACHE[name] = (now, val)
+    return val
+
 def _get_host_ips() -> List[str]:
-    rc, out, _ = _run(["bash", "-lc", "hostname -I | tr ' ' '\\n' | sed '/^$/d'"], timeout=2.0)
-    ips = [x.strip() for x in out.splitlines() if x.strip()]
-    return ips
+    return list(_host_cached("host_ips", _read_host_ips))
+
+def _read_host_ips() -> List[str]:
+    # local IPv4 addresses: "|-- <ip>" followed by "/32 host LOCAL" in /proc/net/fib_trie
+    ips: List[str] = []
+    try:
+        with open("/proc/net/fib_trie", encoding="ascii") as f:
+            last = ""
+            for line in f:
+                line = line.strip()
+                if line.startswith("|-- "):
+                    last = line[4:]
+                elif line.startswith("/32 host LOCAL") and last and last not in ips:
+                    ips.append(last)
+    except OSError:
+        pass
+    # like `hostname -I`: loopback left out
+    return [ip for ip in ips if not ip.startswith("127.")] or ips
 
 def _get_primary_ip() -> str:
+    # source address the kernel would pick for the default route (connect() on UDP sends nothing)
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sk:
+            sk.connect(("192.0.2.1", 9))
+            return sk.getsockname()[0]
+    except OSError:
+        pass
     ips = _get_host_ips()
     # prefer non-loopback
     for ip in ips:
@@ -270,64 +340,137 @@ def _get_primary_ip() -> str:
     return ips[0] if ips else "0.0.0.0"
 
 def _get_default_iface() -> Optional[str]:
-    rc, out, _ = _run(["bash", "-lc", "ip route show default 2>/dev/null | head -n1"], timeout=2.0)
-    m = re.search(r"\bdev\s+(\S+)", out)
-    return m.group(1) if m else None
+    return _host_cached("default_iface", _read_default_iface)
+
+def _read_default_iface() -> Optional[str]:
+    # /proc/net/route: Iface Destination Gateway Flags RefCnt Use Metric Mask ...; default = dest 0, lowest metric
+    best: Optional[Tuple[int, str]] = None
+    try:
+        with open("/proc/net/route", encoding="ascii") as f:
+            next(f, None)
+            for line in f:
+                parts = line.split()
+                if len(parts) < 8 or parts[1] != "00000000" or parts[7] != "00000000":
+                    continue
+                metric = int(parts[6])
+                if best is None or metric < best[0]:
+                    best = (metric, parts[0])
+    except (OSError, ValueError):
+        return None
+    return best[1] if best else None
 
 # ------------------------- Stats IO -------------------------
-def _stats_path() -> Path:
+def _state_path() -> Path:
+    # small state (theme, lifetime port hits, notes); rewritten atomically
     return Path.home() / ".tarpit_watch_stats.json"
 
+def _history_path() -> Path:
+    # ended-session history; append-only, one JSON object per line
+    return Path.home() / ".tarpit_watch_history.ndjson"
+
 def _snapshot_path() -> Path:
     return Path.home() / ".tarpit_watch_snapshot.txt"
 
 def _atomic_write(path: Path, data: str) -> None:
+    # write tmp, fsync, then rename over path: a crash leaves either the old or the new file
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(data, encoding="utf-8")
-    tmp.replace(path)
+    buf = memoryview(data.encode("utf-8"))
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        while buf:
+            buf = buf[os.write(fd, buf):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+def _json_line(item: dict) -> str:
+    return json.dumps(item, separators=(",", ":")) + "\n"
+
+def append_history(items: List[dict]) -> None:
+    if not items:
+        return
+    with _history_path().open("a", encoding="utf-8", buffering=1) as f:
+        f.write("".join(_json_line(it) for it in items))
 
-def load_stats() -> Dict:
-    p = _stats_path()
+def load_history(history_n: int) -> List[dict]:
+    # keep the history_n longest; compacts the log when it has grown past that
+    p = _history_path()
     if not p.exists():
-        return {
-            "version": VERSION,
-            "created": _now_local().isoformat(),
-            "updated": _now_local().isoformat(),
-            "notes": [],
-            "theme": THEMES[0],
-            "lifetime_port_hits": {},
-            "ended_history": [],
-        }
+        return []
+    total = 0
+    def items():
+        nonlocal total
+        with p.open(encoding="utf-8") as f:
+            for line in f:
+                total += 1
+                try:
+                    it = json.loads(line)
+                except ValueError:
+                    continue  # torn last line after a crash
+                if isinstance(it, dict):
+                    yield it
+    hist = heapq.nlargest(max(0, history_n), items(), key=lambda x: x.get("duration_s", 0))
+    if total > len(hist):
+        _atomic_write(p, "".join(_json_line(it) for it in hist))
+    return hist
+
+def _new_stats(notes: List[str]) -> Dict:
+    return {
+        "version": VERSION,
+        "created": _now_local().isoformat(),
+        "updated": _now_local().isoformat(),
+        "notes": notes,
+        "theme": THEMES[0],
+        "lifetime_port_hits": {},
+        "ended_history": [],
+    }
+
+def load_stats(history_n: int = DEFAULT_HISTORY_N) -> Dict:
+    p = _state_path()
+    if not p.exists():
+        d = _new_stats([])
+    else:
+        try:
+            d = json.loads(p.read_text(encoding="utf-8"))
+            if not isinstance(d, dict):
+                raise ValueError("stats not dict")
+            d.setdefault("notes", [])
+            d.setdefault("lifetime_port_hits", {})
+            d.setdefault("theme", THEMES[0])
+            d["version"] = VERSION
+        except Exception as e:
+            d = _new_stats([f"Failed to load stats; started new. error={e!r}"])
+    # older stats files carried the history inline; move it to the log once
+    legacy = d.pop("ended_history", None)
+    if legacy and isinstance(legacy, list) and not _history_path().exists():
+        try:
+            append_history([it for it in legacy if isinstance(it, dict)])
+        except OSError:
+            pass
     try:
-        d = json.loads(p.read_text(encoding="utf-8"))
-        if not isinstance(d, dict):
-            raise ValueError("stats not dict")
-        d.setdefault("notes", [])
-        d.setdefault("lifetime_port_hits", {})
-        d.setdefault("ended_history", [])
-        d.setdefault("theme", THEMES[0])
-        d["version"] = VERSION
-        return d
+        d["ended_history"] = load_history(history_n)
     except Exception as e:
-        return {
-            "version": VERSION,
-            "created": _now_local().isoformat(),
-            "updated": _now_local().isoformat(),
-            "notes": [f"Failed to load stats; started new. error={e!r}"],
-            "theme": THEMES[0],
-            "lifetime_port_hits": {},
-            "ended_history": [],
-        }
+        d["ended_history"] = []
+        d["notes"].append(f"Failed to load history; started new. error={e!r}")
+    return d
 
 def save_stats(stats: Dict) -> None:
     stats["version"] = VERSION
     stats["updated"] = _now_local().isoformat()
-    _atomic_write(_stats_path(), json.dumps(stats, indent=2, sort_keys=True) + "\n")
+    state = {k: v for k, v in stats.items() if k != "ended_history"}
+    _atomic_write(_state_path(), json.dumps(state, separators=(",", ":")) + "\n")
 
 # ------------------------- Session model -------------------------
-@dataclass
+# heapq/sort keys, built once. seq makes the key total: sessions found in the same poll
+# share first_seen, and est_keys is a set, so ties must not fall to hash order.
+_BY_FIRST_SEEN = attrgetter("first_seen", "seq")
+# (src_ip_int, src_port, dst_ip_int, dst_port)
+SessionKey = Tuple[int, int, int, int]
+
+@dataclass(slots=True)
 class Session:
-    key: str
+    key: SessionKey
     src_ip: str
     src_port: int
     dst_ip: str
@@ -336,31 +479,73 @@ class Session:
     timeout_s: int
     first_seen: float
     last_seen: float
+    last_epoch: int = 0  # App._epoch of the last poll that saw this entry
+    seq: int = 0         # insertion order into App.sessions; breaks first_seen ties like dict order
+    age_sec: int = -1    # whole second age_str was formatted for
+    age_str: str = ""
 
     def age_s(self, now: float) -> float:
         return max(0.0, now - self.first_seen)
 
+    def age_text(self, now: float) -> str:
+        # formatted once per second, however many panels show the session
+        sec = int(now)
+        if sec != self.age_sec:
+            self.age_sec = sec
+            self.age_str = _fmt_age(self.age_s(now))
+        return self.age_str
+
+@dataclass(slots=True)
+class SourceAgg:
+    # live sessions of one source IP, kept in step with App.sessions. keys is a dict used
+    # as an insertion-ordered set: first_seen and seq only grow, so the first key is the
+    # source's oldest live session.
+    keys: Dict[SessionKey, None]
+    ports: Counter[int]
+    states: Counter[str]
+
 # ------------------------- Collectors -------------------------
+_LISTEN_CACHE: Dict[Tuple[bool,bool], Tuple[float, List[int]]] = {}
+
 def parse_listen_ports(include_loopback: bool, exclude_admin: bool) -> List[int]:
-    # ss -Hlnpt lists listening TCP ports
-    rc, out, _ = _run(["bash", "-lc", "ss -Hlnpt 2>/dev/null"], timeout=3.0)
+    key = (include_loopback, exclude_admin)
+    now = time.monotonic()
+    hit = _LISTEN_CACHE.get(key)
+    if hit is not None and (now - hit[0]) < LISTEN_CACHE_TTL_S:
+        return list(hit[1])
+    ports = _read_listen_ports(include_loopback, exclude_admin)
+    _LISTEN_CACHE[key] = (now, ports)
+    return list(ports)
+
+_V6_LOOPBACK = socket.inet_pton(socket.AF_INET6, "::1")
+
+def _proc_addr_is_loopback(hex_addr: str) -> bool:
+    # /proc/net/tcp{,6} print addresses as 32-bit words in host byte order
+    raw = b"".join(struct.pack("=I", int(hex_addr[i:i+8], 16)) for i in range(0, len(hex_addr), 8))
+    if len(raw) == 4:
+        return raw[0] == 127
+    return raw == _V6_LOOPBACK or (raw[:12] == b"\0" * 10 + b"\xff\xff" and raw[12] == 127)
+
+def _read_listen_ports(include_loopback: bool, exclude_admin: bool) -> List[int]:
+    # LISTEN sockets from /proc/net/tcp + tcp6 (st == 0A), same view as `ss -Hlnt`
     ports: set[int] = set()
-    for line in out.splitlines():
-        # example: LISTEN 0 4096 0.0.0.0:22 0.0.0.0:* users:(("docker-proxy",pid=..))
-        parts = line.split()
-        if len(parts) < 4:
-            continue
-        local = parts[3]
-        # local can be [::]:22 or 0.0.0.0:22 or 127.0.0.1:xxxx
-        m = re.search(r":(\d+)$", local)
-        if not m:
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            f = open(path, encoding="ascii")
+        except OSError:
             continue
-        ip_part = local.rsplit(":", 1)[0]
-        if not include_loopback:
-            if ip_part.startswith("127.") or ip_part.startswith("[::1]"):
-                continue
-        # we prefer exposed ports: 0.0.0.0, [::], or explicit non-loopback IP
-        ports.add(int(m.group(1)))
+        with f:
+            next(f, None)  # header
+            for line in f:
+                # "   0: 00000000:0016 00000000:0000 0A ..." -> local_address, rem_address, st
+                parts = line.split(None, 4)
+                if len(parts) < 4 or parts[3] != "0A":
+                    continue
+                addr, _, port = parts[1].partition(":")
+                if not include_loopback and _proc_addr_is_loopback(addr):
+                    continue
+                # we prefer exposed ports: 0.0.0.0, [::], or explicit non-loopback IP
+                ports.add(int(port, 16))
     if exclude_admin:
         ports -= set(DEFAULT_EXCLUDE_ADMIN_PORTS)
     return sorted(ports)
@@ -394,31 +579,172 @@ def get_watched_ports(args_watch_ports: Optional[str], include_loopback: bool, e
         ports = [p for p in FALLBACK_WATCH_PORTS if (p not in DEFAULT_EXCLUDE_ADMIN_PORTS or not exclude_admin)]
     return ports
 
+def _nla_parse(buf: bytes, off: int, end: int) -> Dict[int, Tuple[int,int]]:
+    # attribute type -> (payload start, payload end)
+    attrs: Dict[int, Tuple[int,int]] = {}
+    while off + 4 <= end:
+        ln, typ = _NLA.unpack_from(buf, off)
+        if ln < 4:
+            break
+        attrs[typ & NLA_TYPE_MASK] = (off + 4, off + ln)
+        off += (ln + 3) & ~3
+    return attrs
+
+def _ct_tuple(buf: bytes, span: Tuple[int,int]) -> Optional[Tuple[str,str,int,int,int,int]]:
+    # returns (src, dst, sport, dport, src_int, dst_int) for an IPv4 TCP tuple
+    t = _nla_parse(buf, *span)
+    if CTA_TUPLE_IP not in t or CTA_TUPLE_PROTO not in t:
+        return None
+    ip = _nla_parse(buf, *t[CTA_TUPLE_IP])
+    proto = _nla_parse(buf, *t[CTA_TUPLE_PROTO])
+    if CTA_IP_V4_SRC not in ip or CTA_IP_V4_DST not in ip:
+        return None
+    if CTA_PROTO_NUM not in proto or buf[proto[CTA_PROTO_NUM][0]] != socket.IPPROTO_TCP:
+        return None
+    a = ip[CTA_IP_V4_SRC][0]
+    b = ip[CTA_IP_V4_DST][0]
+    return (
+        socket.inet_ntoa(buf[a:a+4]),
+        socket.inet_ntoa(buf[b:b+4]),
+        _BE16.unpack_from(buf, proto[CTA_PROTO_SRC_PORT][0])[0],
+        _BE16.unpack_from(buf, proto[CTA_PROTO_DST_PORT][0])[0],
+        _BE32.unpack_from(buf, a)[0],
+        _BE32.unpack_from(buf, b)[0],
+    )
+
+def _ct_row(buf: bytes, off: int, end: int) -> Optional[dict]:
+    attrs = _nla_parse(buf, off, end)
+    if CTA_TUPLE_ORIG not in attrs or CTA_TUPLE_REPLY not in attrs:
+        return None
+    orig = _ct_tuple(buf, attrs[CTA_TUPLE_ORIG])
+    reply = _ct_tuple(buf, attrs[CTA_TUPLE_REPLY])
+    if orig is None or reply is None:
+        return None
+    state = "NONE"
+    if CTA_PROTOINFO in attrs:
+        pi = _nla_parse(buf, *attrs[CTA_PROTOINFO])
+        if CTA_PROTOINFO_TCP in pi:
+            tcp = _nla_parse(buf, *pi[CTA_PROTOINFO_TCP])
+            if CTA_PROTOINFO_TCP_STATE in tcp:
+                st = buf[tcp[CTA_PROTOINFO_TCP_STATE][0]]
+                state = CT_TCP_STATES[st] if st < len(CT_TCP_STATES) else "NONE"
+    timeout = _BE32.unpack_from(buf, attrs[CTA_TIMEOUT][0])[0] if CTA_TIMEOUT in attrs else 0
+    return {
+        "timeout": timeout,
+        "state": state,
+        "src": orig[0],
+        "dst": orig[1],
+        "sport": orig[2],
+        "dport": orig[3],
+        "rsrc": reply[0],
+        "rdst": reply[1],
+        "rsport": reply[2],
+        "rdport": reply[3],
+        "src_int": orig[4],
+        "dst_int": orig[5],
+    }
+
+def _read_conntrack_netlink(timeout: float = 6.0) -> List[dict]:
+    # dump the IPv4 conntrack table over ctnetlink; raises OSError if not permitted/available
+    with socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_NETFILTER) as sk:
+        sk.settimeout(timeout)
+        sk.bind((0, 0))
+        seq = int(time.time())
+        msg_type = (NFNL_SUBSYS_CTNETLINK << 8) | IPCTNL_MSG_CT_GET
+        req = _NLMSGHDR.pack(_NLMSGHDR.size + _NFGENMSG.size, msg_type, NLM_F_REQUEST | NLM_F_DUMP, seq, 0)
+        sk.send(req + _NFGENMSG.pack(socket.AF_INET, 0, 0))
+
+        rows: List[dict] = []
+        body = _NLMSGHDR.size + _NFGENMSG.size
+        while True:
+            buf = sk.recv(65536)
+            if not buf:
+                return rows
+            off = 0
+            while off + _NLMSGHDR.size <= len(buf):
+                ln, typ, _flags, _seq, _pid = _NLMSGHDR.unpack_from(buf, off)
+                if ln < _NLMSGHDR.size:
+                    return rows
+                if typ == NLMSG_DONE:
+                    return rows
+                if typ == NLMSG_ERROR:
+                    err = -_NLERR.unpack_from(buf, off + _NLMSGHDR.size)[0]
+                    if err:
+                        raise OSError(err, os.strerror(err))
+                elif ln >= body:
+                    try:
+                        row = _ct_row(buf, off + body, off + ln)
+                    except (IndexError, KeyError, struct.error):
+                        row = None
+                    if row is not None:
+                        rows.append(row)
+                off += (ln + 3) & ~3
+
 def read_conntrack_tcp() -> List[dict]:
-    # stderr suppressed because conntrack emits warnings if not root
-    rc, out, _ = _run(["bash", "-lc", "conntrack -L -p tcp 2>/dev/null"], timeout=6.0)
+    try:
+        return _read_conntrack_netlink()
+    except OSError:
+        # no ctnetlink access (not root, nf_conntrack_netlink missing, ...): use the conntrack tool
+        return _read_conntrack_cli()
+
+def _read_conntrack_cli() -> List[dict]:
+    # parsed while conntrack is still writing; stderr ("not root" warnings) goes to /dev/null
     rows: List[dict] = []
-    for line in out.splitlines():
-        m = RE_CT.match(line.strip())
-        if not m:
-            continue
-        try:
-            rows.append({
-                "timeout": int(m.group("timeout")),
-                "state": m.group("state"),
-                "src": m.group("src"),
-                "dst": m.group("dst"),
-                "sport": int(m.group("sport")),
-                "dport": int(m.group("dport")),
-                "rsrc": m.group("rsrc"),
-                "rdst": m.group("rdst"),
-                "rsport": int(m.group("rsport")),
-                "rdport": int(m.group("rdport")),
-            })
-        except Exception:
+    for line in _run_stream(["conntrack", "-L", "-p", "tcp"], timeout=6.0):
+        if not line.startswith(b"tcp "):
             continue
+        row = _parse_conntrack_line(line)
+        if row is not None:
+            rows.append(row)
     return rows
 
+def _parse_conntrack_line(line: bytes) -> Optional[dict]:
+    parts = line.split()
+    if len(parts) < 12 or not parts[2].isdigit():
+        return None
+    vals: List[Optional[bytes]] = [None] * 8  # orig src,dst,sport,dport then reply
+    filled = 0
+    for tok in parts[4:]:
+        k, eq, v = tok.partition(b"=")
+        if not eq:
+            continue  # [UNREPLIED], [ASSURED], ...
+        i = CT_TUPLE_FIELDS.get(k)
+        if i is None:
+            continue
+        if vals[i] is not None:
+            i += 4
+            if vals[i] is not None:
+                continue
+        vals[i] = v
+        filled += 1
+        if filled == 8:
+            break
+    if filled != 8:
+        return None
+    try:
+        src = vals[0].decode("ascii")
+        dst = vals[1].decode("ascii")
+        return {
+            "timeout": int(parts[2]),
+            "state": parts[3].decode("ascii"),
+            "src": src,
+            "dst": dst,
+            "sport": int(vals[2]),
+            "dport": int(vals[3]),
+            "rsrc": vals[4].decode("ascii"),
+            "rdst": vals[5].decode("ascii"),
+            "rsport": int(vals[6]),
+            "rdport": int(vals[7]),
+            "src_int": _ip4_int(src),
+            "dst_int": _ip4_int(dst),
+        }
+    except (ValueError, OSError):
+        return None  # malformed or IPv6 entry
+
+# docker ps host-port mappings: "0.0.0.0:80-81->80-81/tcp", "0.0.0.0:22->2222/tcp"
+_RE_PORT_RANGE = re.compile(r":(\d+)-(\d+)->")
+_RE_PORT_SINGLE = re.compile(r":(\d+)->")
+
 class DockerCache:
     def __init__(self, refresh_s: float = 8.0) -> None:
         self.refresh_s = refresh_s
@@ -426,37 +752,43 @@ class DockerCache:
         self.containers: List[dict] = []
         self.port_map: Dict[int, str] = {}  # host_port -> container (name)
         self.hints: List[str] = []
+        self._last_out: Optional[str] = None  # raw docker ps output of the last parse
+        self.labels: List[str] = []  # "name  image-repo" per container, built once per refresh
+        self.gen = 0  # bumped whenever containers/port_map actually change
 
     def maybe_refresh(self, now: float) -> None:
         if (now - self.last) < self.refresh_s:
             return
         self.last = now
-        rc, out, _ = _run(["bash", "-lc", "docker ps --format '{{.Names}}\t{{.Image}}\t{{.Ports}}' 2>/dev/null"], timeout=4.0)
+        rc, out, _ = _run(["docker", "ps", "--format", "{{.ID}}\t{{.Names}}\t{{.Image}}\t{{.Ports}}"], timeout=4.0)
+        if out == self._last_out:
+            return  # same container IDs/names/ports as last time
+        self._last_out = out
         containers: List[dict] = []
         port_map: Dict[int, str] = {}
         for line in out.splitlines():
             parts = line.split("\t")
-            if len(parts) < 2:
+            if len(parts) < 3:
                 continue
-            name = parts[0].strip()
-            image = parts[1].strip()
-            ports = parts[2].strip() if len(parts) >= 3 else ""
-            containers.append({"name": name, "image": image, "ports": ports})
+            cid = parts[0].strip()
+            name = parts[1].strip()
+            image = parts[2].strip()
+            ports = parts[3].strip() if len(parts) >= 4 else ""
+            containers.append({"id": cid, "name": name, "image": image, "ports": ports})
             # parse host port mappings
             # examples:
             # 0.0.0.0:22->2222/tcp, :::22->2222/tcp
             # 0.0.0.0:80-81->80-81/tcp
             for tok in ports.split(","):
-                tok = tok.strip()
-                if not tok:
-                    continue
-                m = re.search(r":(\d+)-(\d+)->", tok)
+                if "->" not in tok:
+                    continue  # exposed only, no host mapping
+                m = _RE_PORT_RANGE.search(tok)
                 if m:
                     a = int(m.group(1)); b = int(m.group(2))
                     for hp in range(min(a, b), max(a, b)+1):
                         port_map[hp] = name
                     continue
-                m = re.search(r":(\d+)->", tok)
+                m = _RE_PORT_SINGLE.search(tok)
                 if m:
                     hp = int(m.group(1))
                     port_map[hp] = name
@@ -471,19 +803,48 @@ class DockerCache:
         self.containers = containers
         self.port_map = port_map
         self.hints = present
+        self.labels = [f"{c['name']:<18} {c['image'].split('@')[0].split(':')[0]}" for c in containers]
+        self.gen += 1
 
 # ------------------------- System metrics -------------------------
+def _open_ro(path: str) -> Optional[int]:
+    try:
+        return os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+
+def _pread_all(fd: int, chunk: int = 65536) -> bytes:
+    # procfs regenerates the file on a read at offset 0, so a kept-open fd is always current.
+    # Read until EOF: seq_files hand back only whole records per page, so a short read
+    # does not mean the end (/proc/net/dev with many docker veths spans several pages).
+    parts = []
+    off = 0
+    while True:
+        b = os.pread(fd, chunk, off)
+        if not b:
+            break
+        parts.append(b)
+        off += len(b)
+    return b"".join(parts)
+
 class SysMetrics:
     def __init__(self) -> None:
         self.last_t = time.time()
         self.last_cpu: Optional[Tuple[int,int]] = None  # (idle,total)
         self.last_net: Dict[str, Tuple[int,int]] = {}  # iface -> (rx,tx)
         self.last_all: Optional[Tuple[int,int]] = None
+        # kept open across ticks; read with pread instead of re-opening every frame
+        self._stat_fd = _open_ro("/proc/stat")
+        self._mem_fd = _open_ro("/proc/meminfo")
+        self._netdev_fd = _open_ro("/proc/net/dev")
+        self._netdev: Tuple[float, Dict[str, Tuple[int,int]]] = (-1.0, {})
+        self._snap: Optional[dict] = None
+        self._snap_ts = 0.0
 
     def cpu_percent(self) -> float:
         # /proc/stat first line: cpu  user nice system idle iowait irq softirq steal guest guest_nice
         try:
-            line = Path("/proc/stat").read_text().splitlines()[0]
+            line = os.pread(self._stat_fd, 512, 0).split(b"\n", 1)[0]
             parts = line.split()
             vals = list(map(int, parts[1:]))
             idle = vals[3] + (vals[4] if len(vals) > 4 else 0)
@@ -511,13 +872,13 @@ class SysMetrics:
     def mem(self) -> Tuple[int,int]:
         # returns (used_bytes, total_bytes)
         try:
-            meminfo = Path("/proc/meminfo").read_text().splitlines()
-            d = {}
-            for l in meminfo:
-                k, v = l.split(":", 1)
-                d[k.strip()] = v.strip()
-            total_kib = int(d.get("MemTotal","0 kB").split()[0])
-            avail_kib = int(d.get("MemAvailable","0 kB").split()[0])
+            total_kib = avail_kib = 0
+            for l in _pread_all(self._mem_fd).split(b"\n"):
+                if l.startswith(b"MemTotal:"):
+                    total_kib = int(l.split()[1])
+                elif l.startswith(b"MemAvailable:"):
+                    avail_kib = int(l.split()[1])
+                    break
             used_kib = max(0, total_kib - avail_kib)
             return used_kib*1024, total_kib*1024
         except Exception:
@@ -534,15 +895,26 @@ class SysMetrics:
         except Exception:
             return (0,0,0)
 
-    def net_iface_bytes(self, iface: str) -> Tuple[int,int]:
-        rxp = Path(f"/sys/class/net/{iface}/statistics/rx_bytes")
-        txp = Path(f"/sys/class/net/{iface}/statistics/tx_bytes")
-        return int(rxp.read_text().strip()), int(txp.read_text().strip())
+    def net_dev(self, now: float) -> Dict[str, Tuple[int,int]]:
+        # iface -> (rx_bytes, tx_bytes) for every interface from one /proc/net/dev read, cached per tick
+        ts, devs = self._netdev
+        if ts == now:
+            return devs
+        devs = {}
+        # "  eth0: rx_bytes rx_packets ... (8 rx fields) tx_bytes ..."; first two lines are headers
+        for l in _pread_all(self._netdev_fd).split(b"\n")[2:]:
+            name, sep, rest = l.partition(b":")
+            if not sep:
+                continue
+            f = rest.split()
+            devs[name.strip().decode("ascii", "replace")] = (int(f[0]), int(f[8]))
+        self._netdev = (now, devs)
+        return devs
 
     def net_rates(self, iface: str, now: float) -> Tuple[float,float,int,int]:
         # returns (rx_Bps, tx_Bps, rx_total, tx_total)
         try:
-            rx, tx = self.net_iface_bytes(iface)
+            rx, tx = self.net_dev(now)[iface]
             if iface not in self.last_net:
                 self.last_net[iface] = (rx, tx)
                 return (0.0, 0.0, rx, tx)
@@ -556,12 +928,10 @@ class SysMetrics:
     def net_all_rates(self, now: float) -> Tuple[float,float,int,int]:
         # sum non-loopback
         try:
-            ifaces = [p.name for p in Path("/sys/class/net").iterdir() if p.is_dir()]
             rx = 0; tx = 0
-            for i in ifaces:
+            for i, (r, t) in self.net_dev(now).items():
                 if i == "lo":
                     continue
-                r, t = self.net_iface_bytes(i)
                 rx += r; tx += t
             if self.last_all is None:
                 self.last_all = (rx, tx)
@@ -576,25 +946,54 @@ class SysMetrics:
     def tick(self, now: float) -> None:
         self.last_t = now
 
+    def sample_all(self, now: float, tpot_dir: str) -> dict:
+        # one batch of /proc + statvfs reads, reused for SYS_SAMPLE_S; this also keeps the
+        # CPU/net deltas over a steady window however often the UI redraws
+        if self._snap is not None and (now - self._snap_ts) < SYS_SAMPLE_S:
+            return self._snap
+        iface = _get_default_iface() or "?"
+        self._snap = {
+            "cpu": self.cpu_percent(),
+            "load": self.loadavg(),
+            "mem": self.mem(),
+            "disk_root": self.disk("/"),
+            "disk_tpot": self.disk(tpot_dir),
+            "iface": iface,
+            "net_if": self.net_rates(iface, now) if iface != "?" else (0.0, 0.0, 0, 0),
+            "net_all": self.net_all_rates(now),
+        }
+        self._snap_ts = now
+        self.tick(now)
+        return self._snap
+
 # ------------------------- Curses UI -------------------------
+# bound once; the panels format one of these per row per frame
+_SESS_FMT = "{}:{} -> {:<5} {:<6} {:<12} to:{}s".format
+_SRC_FMT = "{:<15} active:{:<2} oldest:{:>5} states:{}".format
+
 def make_attr(pair_id: int, bold: bool = False) -> int:
     a = curses.color_pair(pair_id)
     if bold:
         a |= curses.A_BOLD
     return a
 
+@functools.lru_cache(maxsize=64)
+def _box_edges(w: int) -> Tuple[str, str]:
+    return ("┌" + "─"*(w-2) + "┐", "└" + "─"*(w-2) + "┘")
+
 def draw_box(stdscr, y: int, x: int, h: int, w: int, title: str, A: dict) -> Tuple[int,int,int,int]:
     # ensures minimum
     if h < 3 or w < 10:
         return (y+1, x+1, max(1, h-2), max(1, w-2))
 
     border_attr = A["border"]
-    # corners
-    _safe_add(stdscr, y, x, "┌" + "─"*(w-2) + "┐", border_attr)
+    hw = stdscr.getmaxyx()
+    top, bottom = _box_edges(w)
+    _safe_add(stdscr, y, x, top, border_attr, hw)
     for i in range(1, h-1):
-        _safe_add(stdscr, y+i, x, "│", border_attr)
-        _safe_add(stdscr, y+i, x+w-1, "│", border_attr)
-    _safe_add(stdscr, y+h-1, x, "└" + "─"*(w-2) + "┘", border_attr)
+        _safe_add(stdscr, y+i, x, "│", border_attr, hw)
+        _safe_add(stdscr, y+i, x+w-1, "│", border_attr, hw)
+    _safe_add(stdscr, y+h-1, x, bottom, border_attr, hw)
 
     if title:
         t = f" {title} "
@@ -630,9 +1029,6 @@ def render_help(stdscr, A: dict) -> None:
     for i, line in enumerate(msg[:ih]):
         _safe_add(stdscr, iy+i, ix, line, A["text"])
 
-def clamp_topn(lst: List, n: int) -> List:
-    return lst[:max(0, n)]
-
 def truncate(s: str, n: int) -> str:
     if len(s) <= n:
         return s
@@ -640,11 +1036,28 @@ def truncate(s: str, n: int) -> str:
         return s[:n]
     return s[:n-1] + "…"
 
+@functools.lru_cache(maxsize=8)
+def _render_ports_lines(ports: Tuple[int, ...], wrap: bool, width: int) -> Tuple[str, ...]:
+    # watched-port list as display lines; only rebuilt when ports/wrap/width change
+    wp = " ".join(str(p) for p in ports)
+    if not wrap:
+        return (truncate(wp, width),)
+    # port numbers are never split across lines, even in a very narrow box
+    return tuple(textwrap.wrap(wp, width=max(1, width), break_long_words=False, break_on_hyphens=False))
+
 # ------------------------- Main App -------------------------
 class App:
     def __init__(self, args: argparse.Namespace) -> None:
         self.args = args
-        self.stats = load_stats()
+        self.stats = load_stats(int(args.history_n))
+        # ended history as a min-heap of (duration_s, -seq, item), bounded to history_n;
+        # self.ended_history is the sorted (longest first) view, rebuilt only on change.
+        # It lives outside self.stats: the history log is written by append_history, not save_stats.
+        self.ended_history: List[dict] = self.stats.pop("ended_history", [])
+        self._ended_seq = len(self.ended_history)
+        self._ended_heap: List[Tuple[int, int, dict]] = [
+            (int(it.get("duration_s", 0)), -i, it) for i, it in enumerate(self.ended_history)]
+        heapq.heapify(self._ended_heap)
         self.theme_idx = THEMES.index(self.stats.get("theme", THEMES[0])) if self.stats.get("theme") in THEMES else 0
 
         self.hide_private = True
@@ -652,18 +1065,44 @@ class App:
         self.include_loopback_listen = True   # matches your earlier "LoopbackPorts:IN"
         self.wrap_watch_ports = True
         self.mode = "ALL"  # or "EST"
-        self.last_action = f"Loaded stats ({_stats_path()})"
+        self.last_action = f"Loaded stats ({_state_path()})"
 
         self.host_ip = _get_primary_ip()
         self.host_ips = set(_get_host_ips())
 
-        self.sessions: Dict[str, Session] = {}
+        self.sessions: Dict[SessionKey, Session] = {}
+        self._session_pool: List[Session] = []  # ended Sessions reused instead of reallocated
+        self._session_seq = 0
+        # maintained on session insert/state change/expiry, so views never re-scan self.sessions
+        self.state_counter: Counter[str] = Counter()
+        self.source_counter: Counter[str] = Counter()
+        self.by_ip: Dict[str, SourceAgg] = {}
+        self.port_active: Counter[int] = Counter()
+        self.est_keys: set[SessionKey] = set()
+        self._epoch = 0  # poll counter; sessions not stamped with the current one were not seen
+        self._dirty = True  # anything on screen changed since the last draw_frame
         self.port_hits_run: Dict[int,int] = {}  # current run (not persisted)
+        # live lifetime hits (int keys); stats["lifetime_port_hits"] is only materialized in flush_stats
+        self._lifetime_hot: Counter[int] = Counter()
+        for k, v in self.stats.pop("lifetime_port_hits", {}).items():
+            try:
+                self._lifetime_hot[int(k)] += int(v)
+            except (TypeError, ValueError):
+                pass
         self.last_autosave = time.time()
+        self._autosave_sig: Optional[Tuple[str, str]] = None  # (stats json, snapshot body) last autosaved
 
         self.docker = DockerCache(refresh_s=8.0)
+        self._port2cont: Dict[int, str] = {}
+        self._port2cont_gen = -1
+        # watched ports for the current toggles: (key, ts, ports, frozenset of ports)
+        self._wp_cache: Optional[Tuple[tuple, float, List[int], frozenset]] = None
         self.sys = SysMetrics()
 
+        # conntrack is collected on a worker thread; the UI takes the latest snapshot
+        self._ct_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._ct_thread: Optional[threading.Thread] = None
+
         # for graceful exit
         self._stop = False
 
@@ -676,6 +1115,7 @@ class App:
 
     def set_action(self, s: str) -> None:
         self.last_action = s
+        self._dirty = True
 
     def toggle_theme(self) -> None:
         self.theme_idx = (self.theme_idx + 1) % len(THEMES)
@@ -703,12 +1143,29 @@ class App:
         self.set_action(f"Mode -> {self.mode}")
 
     def reset_lifetime_hits(self) -> None:
-        self.stats["lifetime_port_hits"] = {}
+        self._lifetime_hot.clear()
         self.set_action("Reset lifetime port hits (history kept)")
+        self.flush_stats()
+
+    def flush_stats(self) -> None:
+        self.stats["lifetime_port_hits"] = {str(k): v for k, v in self._lifetime_hot.items()}
         save_stats(self.stats)
 
-    def save_now(self) -> None:
+    def autosave(self) -> bool:
+        # like save_now, but skips both writes (and their fsyncs) when nothing but the
+        # timestamps would differ from the last autosave; returns whether it wrote
+        self.stats["lifetime_port_hits"] = {str(k): v for k, v in self._lifetime_hot.items()}
+        body = self._snapshot_body()
+        sig = (json.dumps({k: v for k, v in self.stats.items() if k != "updated"}, separators=(",", ":")), body)
+        if sig == self._autosave_sig:
+            return False
         save_stats(self.stats)
+        _atomic_write(_snapshot_path(), self.build_snapshot_text(body))
+        self._autosave_sig = sig
+        return True
+
+    def save_now(self) -> None:
+        self.flush_stats()
         snap = self.build_snapshot_text()
         _atomic_write(_snapshot_path(), snap)
         self.set_action(f"Saved stats + snapshot ({_snapshot_path()})")
@@ -716,45 +1173,151 @@ class App:
     def stop(self) -> None:
         self._stop = True
 
-    def container_for_port(self, port: int) -> str:
-        name = self.docker.port_map.get(port)
-        if not name:
-            return "unmapped"
-        # shorten common prefixes
-        return name
+    def watched_ports(self) -> List[int]:
+        # same list object until the toggles change (or, for listen-socket discovery,
+        # until the listen cache would be re-read anyway)
+        key = (self.include_loopback_listen, self.hide_admin)
+        now = time.monotonic()
+        c = self._wp_cache
+        if c is not None and c[0] == key and (self.args.watch_ports or (now - c[1]) < LISTEN_CACHE_TTL_S):
+            return c[2]
+        ports = get_watched_ports(self.args.watch_ports, include_loopback=key[0], exclude_admin=key[1])
+        if c is not None and c[2] == ports:
+            ports = c[2]  # unchanged: keep the identity the run loop compares against
+        self._wp_cache = (key, now, ports, frozenset(ports))
+        return ports
 
-    def build_snapshot_text(self) -> str:
-        now = _now_local()
+    def container_for_port(self, port: int) -> str:
+        if self._port2cont_gen != self.docker.gen:
+            # rebuilt only after a docker refresh that changed something
+            self._port2cont = {p: n for p, n in self.docker.port_map.items() if n}
+            self._port2cont_gen = self.docker.gen
+        return self._port2cont.get(port, "unmapped")
+
+    def build_snapshot_text(self, body: Optional[str] = None) -> str:
+        if body is None:
+            body = self._snapshot_body()
+        return f"TPOT TAR-PIT WATCH v{VERSION} snapshot\nTime: {_now_local().isoformat()}\n" + body
+
+    def _snapshot_body(self) -> str:
+        # everything below the Time: line
         lines = []
-        lines.append(f"TPOT TAR-PIT WATCH v{VERSION} snapshot")
-        lines.append(f"Time: {now.isoformat()}")
         lines.append(f"Host: {self.host_ip}")
         lines.append(f"Theme: {self.theme_label()}")
         lines.append(f"Private:{'HIDE' if self.hide_private else 'SHOW'}  Admin:{'HIDE' if self.hide_admin else 'SHOW'}  Loopback:{'IN' if self.include_loopback_listen else 'OUT'}  Mode:{self.mode}")
         lines.append("")
         # ended history
-        hist = list(self.stats.get("ended_history", []))
-        hist.sort(key=lambda x: x.get("duration_s", 0), reverse=True)
+        hist = self.ended_history
         lines.append("Longest ESTABLISHED (ENDED history):")
         for item in hist[:20]:
             lines.append(f"- {item.get('src')}:{item.get('sport')} -> {item.get('dport')}  { _fmt_age(item.get('duration_s',0)) }  [{item.get('container','unmapped')}]")
         lines.append("")
         # port hits
-        ph = self.stats.get("lifetime_port_hits", {})
-        items = sorted(((int(k), int(v)) for k,v in ph.items()), key=lambda x: x[1], reverse=True)
         lines.append("Top total port hits (lifetime):")
-        for p, c in items[:20]:
+        for p, c in self._lifetime_hot.most_common(20):
             lines.append(f"- {p}: {c}")
         lines.append("")
         return "\n".join(lines) + "\n"
 
-    def update_sessions(self, watched_ports: List[int], now: float) -> Tuple[Dict[str,int], List[Session]]:
+    def _new_session(self, key: SessionKey, src_ip: str, src_port: int, dst_ip: str, dst_port: int, state: str, timeout_s: int, now: float) -> Session:
+        self._session_seq += 1
+        if not self._session_pool:
+            return Session(key, src_ip, src_port, dst_ip, dst_port, state, timeout_s, now, now, self._epoch, self._session_seq)
+        s = self._session_pool.pop()
+        s.key = key
+        s.src_ip = src_ip
+        s.src_port = src_port
+        s.dst_ip = dst_ip
+        s.dst_port = dst_port
+        s.state = state
+        s.timeout_s = timeout_s
+        s.first_seen = now
+        s.last_seen = now
+        s.last_epoch = self._epoch
+        s.age_sec = -1
+        s.seq = self._session_seq
+        return s
+
+    def _ct_loop(self) -> None:
+        poll_s = max(0.1, float(self.args.poll))
+        while not self._stop:
+            try:
+                rows = read_conntrack_tcp()
+            except Exception:
+                rows = None
+            if rows is not None:
+                # keep only the newest snapshot
+                try:
+                    self._ct_queue.get_nowait()
+                except queue.Empty:
+                    pass
+                self._ct_queue.put_nowait(rows)
+            time.sleep(poll_s)
+
+    def start_collector(self) -> None:
+        if self._ct_thread is None:
+            self._ct_thread = threading.Thread(target=self._ct_loop, name="conntrack", daemon=True)
+            self._ct_thread.start()
+
+    def latest_conntrack(self) -> Optional[List[dict]]:
+        # newest snapshot from the collector, or None if nothing arrived since the last call
+        try:
+            return self._ct_queue.get_nowait()
+        except queue.Empty:
+            return None
+
+    # live indexes over self.sessions; every insert/state change/expiry goes through these
+    def _track_add(self, sess: Session) -> None:
+        self.state_counter[sess.state] += 1
+        self.source_counter[sess.src_ip] += 1
+        agg = self.by_ip.get(sess.src_ip)
+        if agg is None:
+            agg = self.by_ip[sess.src_ip] = SourceAgg({}, Counter(), Counter())
+        agg.keys[sess.key] = None
+        agg.ports[sess.dst_port] += 1
+        agg.states[sess.state] += 1
+        self.port_active[sess.dst_port] += 1
+        if sess.state == "ESTABLISHED":
+            self.est_keys.add(sess.key)
+        self._dirty = True
+
+    def _track_state(self, sess: Session, state: str) -> None:
+        _counter_dec(self.state_counter, sess.state)
+        self.state_counter[state] += 1
+        states = self.by_ip[sess.src_ip].states
+        _counter_dec(states, sess.state)
+        states[state] += 1
+        if state == "ESTABLISHED":
+            self.est_keys.add(sess.key)
+        else:
+            self.est_keys.discard(sess.key)
+        self._dirty = True
+
+    def _track_remove(self, sess: Session) -> None:
+        _counter_dec(self.state_counter, sess.state)
+        _counter_dec(self.source_counter, sess.src_ip)
+        agg = self.by_ip.get(sess.src_ip)
+        if agg is not None:
+            agg.keys.pop(sess.key, None)
+            if not agg.keys:
+                del self.by_ip[sess.src_ip]
+            else:
+                _counter_dec(agg.ports, sess.dst_port)
+                _counter_dec(agg.states, sess.state)
+        _counter_dec(self.port_active, sess.dst_port)
+        self.est_keys.discard(sess.key)
+        self._dirty = True
+
+    def update_sessions(self, watched_ports: List[int], now: float, rows: Optional[List[dict]] = None) -> Tuple[Counter[str], Iterable[Session]]:
         self.host_ips = set(_get_host_ips())
-        rows = read_conntrack_tcp()
+        if rows is None:
+            rows = read_conntrack_tcp()
 
-        watched = set(watched_ports)
-        state_counts: Dict[str,int] = {}
-        seen_keys: set[str] = set()
+        c = self._wp_cache
+        watched = c[3] if c is not None and c[2] is watched_ports else frozenset(watched_ports)
+        self._epoch += 1
+        epoch = self._epoch
+        sessions = self.sessions
 
         for r in rows:
             dport = r["dport"]
@@ -762,7 +1325,7 @@ class App:
                 continue
 
             src_ip = r["src"]
-            if self.hide_private and _is_private_ipv4(src_ip):
+            if self.hide_private and _is_private_ipv4(r["src_int"]):
                 continue
 
             if self.hide_admin and dport in DEFAULT_EXCLUDE_ADMIN_PORTS:
@@ -772,105 +1335,119 @@ class App:
             if self.mode == "EST" and state != "ESTABLISHED":
                 continue
 
-            key = f"{src_ip}:{r['sport']}->{r['dst']}:{dport}"
-            seen_keys.add(key)
-
-            state_counts[state] = state_counts.get(state, 0) + 1
-
-            if key not in self.sessions:
-                self.sessions[key] = Session(
-                    key=key,
-                    src_ip=src_ip,
-                    src_port=r["sport"],
-                    dst_ip=r["dst"],
-                    dst_port=dport,
-                    state=state,
-                    timeout_s=r["timeout"],
-                    first_seen=now,
-                    last_seen=now,
-                )
+            key = (r["src_int"], r["sport"], r["dst_int"], dport)
+
+            s = sessions.get(key)
+            if s is None:
+                s = self._new_session(key, src_ip, r["sport"], r["dst"], dport, state, r["timeout"], now)
+                sessions[key] = s
+                self._track_add(s)
                 # increment port hits (run + lifetime)
                 self.port_hits_run[dport] = self.port_hits_run.get(dport, 0) + 1
-                lph = self.stats.get("lifetime_port_hits", {})
-                lph[str(dport)] = int(lph.get(str(dport), 0)) + 1
-                self.stats["lifetime_port_hits"] = lph
+                self._lifetime_hot[dport] += 1
             else:
-                s = self.sessions[key]
-                s.state = state
-                s.timeout_s = r["timeout"]
+                # the common case is an unchanged entry: only store what moved
+                if s.state != state:
+                    self._track_state(s, state)
+                    s.state = state
+                timeout = r["timeout"]
+                if s.timeout_s != timeout:
+                    s.timeout_s = timeout
                 s.last_seen = now
+                s.last_epoch = epoch
 
-        # expire
-        ended: List[Session] = []
-        grace = float(self.args.grace)
-        for key, sess in list(self.sessions.items()):
-            if key in seen_keys:
-                continue
-            if (now - sess.last_seen) >= grace:
-                ended.append(sess)
-                del self.sessions[key]
+        # expire: collect first, delete after, so the dict isn't copied just to iterate it
+        cutoff = now - float(self.args.grace)
+        ended: List[Session] = [sess for sess in sessions.values()
+                                if sess.last_epoch != epoch and sess.last_seen <= cutoff]
+        for sess in ended:
+            del sessions[sess.key]
+            self._track_remove(sess)
 
         # record ended sessions into history (only if they ever were ESTABLISHED OR if mode is ALL we still keep)
-        hist: List[dict] = list(self.stats.get("ended_history", []))
+        if ended:
+            heap = self._ended_heap
+            history_n = int(self.args.history_n)
+            ended_ts = _now_local().isoformat()
+            added: List[dict] = []
+            for sess in ended:
+                item = {
+                    "ended_ts": ended_ts,
+                    "src": sess.src_ip,
+                    "sport": sess.src_port,
+                    "dst": sess.dst_ip,
+                    "dport": sess.dst_port,
+                    "state": sess.state,
+                    "duration_s": int(max(0.0, sess.last_seen - sess.first_seen)),
+                    "container": self.container_for_port(sess.dst_port),
+                }
+                added.append(item)
+                # -seq: on equal durations the older entry wins, as with the old stable sort
+                self._ended_seq += 1
+                entry = (item["duration_s"], -self._ended_seq, item)
+                if len(heap) < history_n:
+                    heapq.heappush(heap, entry)
+                elif heap and entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+            self.ended_history = [e[2] for e in sorted(heap, reverse=True)]
+            # only entries that made the top N go to the on-disk log
+            kept = {id(e[2]) for e in heap}
+            try:
+                append_history([it for it in added if id(it) in kept])
+            except OSError as e:
+                self.set_action(f"History append failed: {e!r}")
+
+        # ended sessions are no longer referenced; keep them for reuse
+        pool = self._session_pool
         for sess in ended:
-            duration = sess.last_seen - sess.first_seen
-            container = self.container_for_port(sess.dst_port)
-            hist.append({
-                "ended_ts": _now_local().isoformat(),
-                "src": sess.src_ip,
-                "sport": sess.src_port,
-                "dst": sess.dst_ip,
-                "dport": sess.dst_port,
-                "state": sess.state,
-                "duration_s": int(max(0.0, duration)),
-                "container": container,
-            })
-        # keep top N
-        hist.sort(key=lambda x: x.get("duration_s", 0), reverse=True)
-        hist = hist[: int(self.args.history_n) ]
-        self.stats["ended_history"] = hist
-
-        active = list(self.sessions.values())
-        return state_counts, active
-
-    def compute_views(self, active: List[Session], now: float, topn: int) -> dict:
-        # sessions list
-        active_sorted = sorted(active, key=lambda s: (s.state != "ESTABLISHED", -(s.age_s(now))), reverse=False)
-        sessions_top = clamp_topn(active_sorted, topn)
-
-        # top sources
-        by_ip: Dict[str, List[Session]] = {}
-        for s in active:
-            by_ip.setdefault(s.src_ip, []).append(s)
-        src_rows = []
-        for ip, lst in by_ip.items():
-            oldest = max((x.age_s(now) for x in lst), default=0.0)
-            states = sorted(set(x.state for x in lst))
-            ports = sorted(set(x.dst_port for x in lst))
-            src_rows.append({
+            if len(pool) >= SESSION_POOL_MAX:
+                break
+            pool.append(sess)
+
+        # a live view, not a copy: compute_views walks it right away on this thread
+        return self.state_counter, self.sessions.values()
+
+    def compute_views(self, active: Iterable[Session], now: float, topn: int) -> dict:
+        # the only walk over every session; per-IP, per-port and ESTABLISHED data come
+        # from the indexes update_sessions keeps (by_ip, port_active, est_keys).
+        # sessions list: ESTABLISHED first, then oldest; first_seen orders the same as age
+        # and doesn't depend on now. nsmallest == sorted()[:topn] without sorting everything.
+        topn = max(0, topn)
+        sessions_top = heapq.nsmallest(topn, active, key=lambda s: (s.state != "ESTABLISHED", s.first_seen))
+
+        # top sources, ranked by (active, oldest) like a full sort of every source would.
+        # Only IPs whose count reaches the topn-th highest count can make the cut; each one's
+        # oldest session is the first entry of its SourceAgg.keys, so this walks IPs, not sessions.
+        sessions = self.sessions
+        cut = self.source_counter.most_common(topn)
+        floor = cut[-1][1] if len(cut) == topn and cut else 1  # fewer than topn IPs: all qualify
+        candidates = []
+        if cut:
+            for ip, n in self.source_counter.items():
+                if n >= floor:
+                    # (first_seen, seq) of the source's oldest session: ties fall back to
+                    # session insertion order, as the old group-then-stable-sort did
+                    first = sessions[next(iter(self.by_ip[ip].keys))]
+                    candidates.append((n, (first.first_seen, first.seq), ip))
+        src_top = []
+        for n, (oldest, _seq), ip in heapq.nlargest(topn, candidates, key=lambda c: (c[0], -c[1][0], -c[1][1])):
+            agg = self.by_ip[ip]
+            src_top.append({
                 "ip": ip,
-                "active": len(lst),
-                "oldest_s": oldest,
-                "states": states,
-                "ports": ports,
+                "active": n,
+                "oldest_first_seen": oldest,  # age is taken at render time
+                "states": sorted(agg.states),
+                "ports": sorted(agg.ports),
             })
-        src_rows.sort(key=lambda r: (r["active"], r["oldest_s"]), reverse=True)
-        src_top = clamp_topn(src_rows, topn)
 
-        # port active counts
-        port_active: Dict[int,int] = {}
-        for s in active:
-            port_active[s.dst_port] = port_active.get(s.dst_port, 0) + 1
-        port_active_items = sorted(port_active.items(), key=lambda x: x[1], reverse=True)
+        # port active counts (maintained incrementally)
+        port_active_items = self.port_active.most_common(max(topn, PORT_ROWS))
 
         # longest established active now
-        est = [s for s in active if s.state == "ESTABLISHED"]
-        est.sort(key=lambda s: s.age_s(now), reverse=True)
-        est_top = clamp_topn(est, topn)
+        est_top = heapq.nsmallest(topn, (sessions[k] for k in self.est_keys), key=_BY_FIRST_SEEN)
 
-        # ended history is already in stats sorted desc
-        ended_hist = list(self.stats.get("ended_history", []))
-        ended_hist.sort(key=lambda x: x.get("duration_s", 0), reverse=True)
+        # ended history is kept sorted longest first
+        ended_hist = self.ended_history
 
         return {
             "sessions_top": sessions_top,
@@ -900,7 +1477,7 @@ class App:
         _safe_hline(stdscr, H-2, 0, W-1, "─", A["border"])
         _safe_add(stdscr, H-1, 0, truncate(keys, W-1), A["dim"])
 
-    def render_sessions_sources_combined(self, stdscr, y: int, x: int, h: int, w: int, watched_ports: List[int], state_counts: Dict[str,int], view: dict, A: dict) -> None:
+    def render_sessions_sources_combined(self, stdscr, y: int, x: int, h: int, w: int, watched_ports: List[int], state_counts: Counter[str], view: dict, A: dict, now: float) -> None:
         # split interior into 2 columns
         left_w = max(18, w // 2)
         right_w = max(18, w - left_w - 1)
@@ -916,57 +1493,52 @@ class App:
         _safe_add(stdscr, ytop, xdiv+1, " TOP SOURCES ", A["title"])
 
         # vertical divider
+        hw = stdscr.getmaxyx()
         for i in range(h):
-            _safe_add(stdscr, y+i, xdiv, "│", A["border"])
+            _safe_add(stdscr, y+i, xdiv, "│", A["border"], hw)
 
         # header lines
         total = sum(state_counts.values())
-        parts = [f"{k}:{v}" for k, v in sorted(state_counts.items(), key=lambda kv: kv[0])]
+        parts = [f"{k}:{v}" for k, v in sorted(state_counts.items())]
         header = f"Conntrack states (watched ports): total {total}"
         if parts:
             header += " | " + " ".join(parts)
         _safe_add(stdscr, y, x, truncate(header, left_w-1), A["dim"])
         _safe_add(stdscr, y+1, x, truncate(f"Showing: {self.mode} states | Active shown: {len(view['sessions_top'])}", left_w-1), A["dim"])
 
-        # sessions list
-        row = y+3
-        now = time.time()
-        for sess in view["sessions_top"]:
-            if row >= y+h:
-                break
-            line = f"{sess.src_ip}:{sess.src_port} -> {sess.dst_port:<5} {_fmt_age(sess.age_s(now)):<6} {sess.state:<12} to:{sess.timeout_s}s"
-            _safe_add(stdscr, row, x, truncate(line, left_w-1), A["text"])
-            row += 1
+        # sessions list: build the visible lines, then write them in one loop
+        rows_left = max(0, h - 3)
+        lines = [truncate(_SESS_FMT(s.src_ip, s.src_port, s.dst_port, s.age_text(now), s.state, s.timeout_s), left_w-1)
+                 for s in view["sessions_top"][:rows_left]]
+        attr = A["text"]
+        for i, line in enumerate(lines):
+            _safe_add(stdscr, y+3+i, x, line, attr, hw)
 
-        # sources list
+        # sources list (two rows per source)
         row = y
         sx = xdiv + 1
+        dim = A["dim"]
         for src in view["sources_top"]:
             if row >= y+h:
                 break
-            st = ",".join(src["states"])
-            line = f"{src['ip']:<15} active:{src['active']:<2} oldest:{_fmt_age(src['oldest_s']):>5} states:{st}"
-            _safe_add(stdscr, row, sx, truncate(line, right_w), A["text"])
+            line = _SRC_FMT(src["ip"], src["active"], _fmt_age(now - src["oldest_first_seen"]), ",".join(src["states"]))
+            _safe_add(stdscr, row, sx, truncate(line, right_w), attr, hw)
             row += 1
             # ports subline
             ports = ",".join(map(str, src["ports"]))
-            _safe_add(stdscr, row, sx+2, truncate(f"ports: {ports}", right_w-2), A["dim"])
+            _safe_add(stdscr, row, sx+2, truncate(f"ports: {ports}", right_w-2), dim, hw)
             row += 1
 
-    def render_pc_info(self, stdscr, y: int, x: int, h: int, w: int, tpot_dir: str, A: dict) -> None:
-        now = time.time()
-        cpu = self.sys.cpu_percent()
-        la1, la5, la15 = self.sys.loadavg()
-        mem_used, mem_total = self.sys.mem()
-        du, dt, df = self.sys.disk("/")
-        tu, tt, tf = self.sys.disk(tpot_dir)
-
-        iface = _get_default_iface() or "?"
-        rx_bps, tx_bps, rx_tot, tx_tot = (0.0, 0.0, 0, 0)
-        all_rx_bps, all_tx_bps, all_rx_tot, all_tx_tot = (0.0, 0.0, 0, 0)
-        if iface != "?":
-            rx_bps, tx_bps, rx_tot, tx_tot = self.sys.net_rates(iface, now)
-        all_rx_bps, all_tx_bps, all_rx_tot, all_tx_tot = self.sys.net_all_rates(now)
+    def render_pc_info(self, stdscr, y: int, x: int, h: int, w: int, tpot_dir: str, A: dict, now: float) -> None:
+        snap = self.sys.sample_all(now, tpot_dir)
+        cpu = snap["cpu"]
+        la1, la5, la15 = snap["load"]
+        mem_used, mem_total = snap["mem"]
+        du, dt, df = snap["disk_root"]
+        tu, tt, tf = snap["disk_tpot"]
+        iface = snap["iface"]
+        rx_bps, tx_bps, rx_tot, tx_tot = snap["net_if"]
+        all_rx_bps, all_tx_bps, all_rx_tot, all_tx_tot = snap["net_all"]
 
         row = y
         _safe_add(stdscr, row, x, "PC INFO", A["title"]); row += 1
@@ -983,10 +1555,7 @@ class App:
         _safe_add(stdscr, row, x, f"ALL rate: RX {_human_rate_bytes_per_s(all_rx_bps)} | TX {_human_rate_bytes_per_s(all_tx_bps)}", A["text"]); row += 1
         _safe_add(stdscr, row, x, f"ALL total: RX {_human_bytes(all_rx_tot)} | TX {_human_bytes(all_tx_tot)}", A["text"]); row += 1
 
-        # tick time base
-        self.sys.tick(now)
-
-    def render_docker_established(self, stdscr, y: int, x: int, h: int, w: int, view: dict, A: dict) -> None:
+    def render_docker_established(self, stdscr, y: int, x: int, h: int, w: int, view: dict, A: dict, now: float) -> None:
         row = y
         _safe_add(stdscr, row, x, "DOCKER + ESTABLISHED", A["title"]); row += 1
 
@@ -996,25 +1565,19 @@ class App:
         _safe_add(stdscr, row, x, f"Docker containers: {len(cont)} | Hints: {hints}", A["dim"]); row += 1
 
         # show a couple containers (name + image repo)
-        shown = 0
-        for c in cont:
-            if shown >= 4:
-                break
-            name = c["name"]
-            image = c["image"].split("@")[0]
-            image = image.split(":")[0]
-            line = f"{name:<18} {image}"
+        for line in self.docker.labels[:4]:
             _safe_add(stdscr, row, x, truncate(line, w), A["text"]); row += 1
-            shown += 1
         row += 1
 
         # Longest active ESTABLISHED now
         _safe_add(stdscr, row, x, "Longest ESTABLISHED (ACTIVE now):", A["title"]); row += 1
-        now = time.time()
+        text = A["text"]
+        hw = stdscr.getmaxyx()
+        container_for_port = self.container_for_port
         for sess in view["est_top"][:min(8, h//6 + 2)]:
-            container = self.container_for_port(sess.dst_port)
-            line = f"{sess.src_ip}:{sess.src_port} -> {sess.dst_port:<5} {_fmt_age(sess.age_s(now)):<6} [{container}]"
-            _safe_add(stdscr, row, x, truncate(line, w), A["text"]); row += 1
+            dport = sess.dst_port
+            line = f"{sess.src_ip}:{sess.src_port} -> {dport:<5} {sess.age_text(now):<6} [{container_for_port(dport)}]"
+            _safe_add(stdscr, row, x, truncate(line, w), text, hw); row += 1
             if row >= y+h:
                 return
         row += 1
@@ -1022,8 +1585,9 @@ class App:
         # Longest ended history
         _safe_add(stdscr, row, x, "Longest ESTABLISHED (ENDED history):", A["title"]); row += 1
         for item in view["ended_hist"][:min(10, max(0, y+h-row))]:
-            line = f"{item.get('src')}:{item.get('sport')} -> {item.get('dport'):<5} {_fmt_age(item.get('duration_s',0)):<6} [{item.get('container','unmapped')}]"
-            _safe_add(stdscr, row, x, truncate(line, w), A["text"]); row += 1
+            get = item.get
+            line = f"{get('src')}:{get('sport')} -> {get('dport'):<5} {_fmt_age(get('duration_s',0)):<6} [{get('container','unmapped')}]"
+            _safe_add(stdscr, row, x, truncate(line, w), text, hw); row += 1
             if row >= y+h:
                 return
 
@@ -1033,112 +1597,124 @@ class App:
 
         # active ports
         _safe_add(stdscr, row, x, "Top active ports:", A["dim"]); row += 1
-        for p, c in view["port_active_items"][:6]:
+        for p, c in view["port_active_items"][:PORT_ROWS]:
             _safe_add(stdscr, row, x, f"{p:<6} active:{c}", A["text"]); row += 1
             if row >= y+h:
                 return
 
         row += 1
         _safe_add(stdscr, row, x, "Top total port hits (lifetime stats):", A["dim"]); row += 1
-        lph = self.stats.get("lifetime_port_hits", {})
-        items = sorted(((int(k), int(v)) for k,v in lph.items()), key=lambda kv: kv[1], reverse=True)
-        for p, c in items[:6]:
+        for p, c in self._lifetime_hot.most_common(PORT_ROWS):
             _safe_add(stdscr, row, x, f"{p:<6} total:{c}", A["text"]); row += 1
             if row >= y+h:
                 return
 
         row += 1
         _safe_add(stdscr, row, x, "Watched ports:", A["dim"]); row += 1
-        wp = " ".join(str(p) for p in watched_ports)
-        if self.wrap_watch_ports:
-            # naive wrap
-            col = 0
-            for tok in wp.split():
-                if row >= y+h:
-                    break
-                if col + len(tok) + 1 > w:
-                    row += 1
-                    col = 0
-                _safe_add(stdscr, row, x+col, tok + " ", A["text"])
-                col += len(tok) + 1
-        else:
-            _safe_add(stdscr, row, x, truncate(wp, w), A["text"])
+        for line in _render_ports_lines(tuple(watched_ports), self.wrap_watch_ports, w):
+            if row >= y+h:
+                break
+            _safe_add(stdscr, row, x, line, A["text"])
+            row += 1
 
     # ------------------------- Loop -------------------------
+    def draw_frame(self, stdscr, A: dict, watched_ports: List[int], state_counts: Counter[str], view: dict, tpot_dir: str, show_help: bool, now: float) -> None:
+        stdscr.erase()
+        self.render_header(stdscr, A)
+
+        H, W = stdscr.getmaxyx()
+        content_top = 3
+        content_bottom = H - 2  # footer separator line at H-2, keys at H-1
+        content_h = max(1, content_bottom - content_top)
+        midy = content_top + content_h // 2
+        midx = W // 2
+
+        # Boxes
+        # Top-left: combined sessions+sources (blank title)
+        iy, ix, ih, iw = draw_box(stdscr, content_top, 0, max(3, midy-content_top), max(10, midx), "", A)
+        self.render_sessions_sources_combined(stdscr, iy, ix, ih, iw, watched_ports, state_counts, view, A, now)
+
+        # Top-right: PC INFO
+        iy2, ix2, ih2, iw2 = draw_box(stdscr, content_top, midx, max(3, midy-content_top), max(10, W-midx), "", A)
+        self.render_pc_info(stdscr, iy2, ix2, ih2, iw2, tpot_dir, A, now)
+
+        # Bottom-left: Docker + Established
+        iy3, ix3, ih3, iw3 = draw_box(stdscr, midy, 0, max(3, content_bottom-midy), max(10, midx), "", A)
+        self.render_docker_established(stdscr, iy3, ix3, ih3, iw3, view, A, now)
+
+        # Bottom-right: ports
+        iy4, ix4, ih4, iw4 = draw_box(stdscr, midy, midx, max(3, content_bottom-midy), max(10, W-midx), "", A)
+        self.render_ports(stdscr, iy4, ix4, ih4, iw4, watched_ports, view, A)
+
+        self.render_footer(stdscr, A)
+
+        if show_help:
+            render_help(stdscr, A)
+
+        # one physical update per frame; curses sends only the cells that changed
+        stdscr.noutrefresh()
+        curses.doupdate()
+
     def run(self, stdscr) -> None:
         curses.curs_set(0)
         stdscr.nodelay(True)
         stdscr.timeout(150)
 
-        init_theme(self.theme())
+        applied_theme = self.theme()
+        init_theme(applied_theme)
+        # pair ids are fixed; a theme change only redefines the pairs' colors
+        A = {
+            "border": make_attr(P_BORDER),
+            "title":  make_attr(P_TITLE, bold=True),
+            "text":   make_attr(P_TEXT),
+            "dim":    make_attr(P_DIM),
+            "warn":   make_attr(P_WARN, bold=True),
+            "bad":    make_attr(P_BAD, bold=True),
+        }
 
         show_help = False
         tpot_dir = os.environ.get("TPOT_DIR", str(Path.home() / "tpotce"))
+        topn = int(self.args.topn)
+
+        # UI ticks every 150ms; sessions/views only change when the collector delivers rows
+        self.start_collector()
+        state_counts = self.state_counter
+        view = self.compute_views([], time.time(), topn)
+        drawn_sec, drawn_docker, drawn_ports = -1, -1, None
 
         while not self._stop:
             now = time.time()
 
-            # refresh theme
-            init_theme(self.theme())
-            A = {
-                "border": make_attr(P_BORDER),
-                "title":  make_attr(P_TITLE, bold=True),
-                "text":   make_attr(P_TEXT),
-                "dim":    make_attr(P_DIM),
-                "warn":   make_attr(P_WARN, bold=True),
-                "bad":    make_attr(P_BAD, bold=True),
-            }
+            if self.theme() != applied_theme:
+                applied_theme = self.theme()
+                init_theme(applied_theme)
 
             self.docker.maybe_refresh(now)
 
-            watched_ports = get_watched_ports(self.args.watch_ports, include_loopback=self.include_loopback_listen, exclude_admin=self.hide_admin)
-            state_counts, active = self.update_sessions(watched_ports, now)
-            view = self.compute_views(active, now, int(self.args.topn))
+            watched_ports = self.watched_ports()
+            rows = self.latest_conntrack()
+            if rows is not None:
+                state_counts, active = self.update_sessions(watched_ports, now, rows)
+                view = self.compute_views(active, now, topn)
 
             # autosave
             if (now - self.last_autosave) >= float(self.args.autosave):
                 try:
-                    save_stats(self.stats)
-                    _atomic_write(_snapshot_path(), self.build_snapshot_text())
+                    if self.autosave():
+                        self.set_action(f"Autosaved stats + snapshot ({int(self.args.autosave)}s)")
                     self.last_autosave = now
-                    self.set_action(f"Autosaved stats + snapshot ({int(self.args.autosave)}s)")
                 except Exception as e:
                     self.set_action(f"Autosave failed: {e!r}")
 
-            # render
-            stdscr.erase()
-            self.render_header(stdscr, A)
-
-            H, W = stdscr.getmaxyx()
-            content_top = 3
-            content_bottom = H - 2  # footer separator line at H-2, keys at H-1
-            content_h = max(1, content_bottom - content_top)
-            midy = content_top + content_h // 2
-            midx = W // 2
-
-            # Boxes
-            # Top-left: combined sessions+sources (blank title)
-            iy, ix, ih, iw = draw_box(stdscr, content_top, 0, max(3, midy-content_top), max(10, midx), "", A)
-            self.render_sessions_sources_combined(stdscr, iy, ix, ih, iw, watched_ports, state_counts, view, A)
-
-            # Top-right: PC INFO
-            iy2, ix2, ih2, iw2 = draw_box(stdscr, content_top, midx, max(3, midy-content_top), max(10, W-midx), "", A)
-            self.render_pc_info(stdscr, iy2, ix2, ih2, iw2, tpot_dir, A)
-
-            # Bottom-left: Docker + Established
-            iy3, ix3, ih3, iw3 = draw_box(stdscr, midy, 0, max(3, content_bottom-midy), max(10, midx), "", A)
-            self.render_docker_established(stdscr, iy3, ix3, ih3, iw3, view, A)
-
-            # Bottom-right: ports
-            iy4, ix4, ih4, iw4 = draw_box(stdscr, midy, midx, max(3, content_bottom-midy), max(10, W-midx), "", A)
-            self.render_ports(stdscr, iy4, ix4, ih4, iw4, watched_ports, view, A)
-
-            self.render_footer(stdscr, A)
-
-            if show_help:
-                render_help(stdscr, A)
-
-            stdscr.refresh()
+            # render only when something visible changed; whole seconds cover the
+            # header clock, ages, conntrack timeouts and the PC INFO sample
+            sec = int(now)
+            if sec != drawn_sec or self.docker.gen != drawn_docker or watched_ports is not drawn_ports:
+                self._dirty = True
+            if self._dirty:
+                self._dirty = False
+                drawn_sec, drawn_docker, drawn_ports = sec, self.docker.gen, watched_ports
+                self.draw_frame(stdscr, A, watched_ports, state_counts, view, tpot_dir, show_help, now)
 
             # input
             try:
@@ -1148,6 +1724,7 @@ class App:
 
             if ch == -1:
                 continue
+            self._dirty = True  # toggles, help and KEY_RESIZE all show up on the next frame
             if show_help and ch in (ord('h'), ord('?')):
                 show_help = False
                 self.set_action("Closed help")
@@ -1178,14 +1755,14 @@ class App:
 
         # final save
         try:
-            save_stats(self.stats)
+            self.flush_stats()
         except Exception:
             pass
 
 def parse_args() -> argparse.Namespace:
     ap = argparse.ArgumentParser(description="TPOT TAR-PIT WATCH (conntrack watcher)")
     ap.add_argument("--watch-ports", default=None, help="Comma-separated ports or ranges (e.g. '22,80,443,3389,8080' or '20-25')")
-    ap.add_argument("--poll", type=float, default=DEFAULT_POLL_S, help="UI poll interval (seconds)")
+    ap.add_argument("--poll", type=float, default=DEFAULT_POLL_S, help="conntrack poll interval (seconds); the UI keeps its own 150ms tick")
     ap.add_argument("--grace", type=float, default=DEFAULT_GRACE_S, help="Seconds before a missing conntrack entry is considered ended")
     ap.add_argument("--topn", type=int, default=DEFAULT_TOPN, help="Top N to show")
     ap.add_argument("--history-n", type=int, default=DEFAULT_HISTORY_N, help="How many ended sessions to keep in history")
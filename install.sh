@@ -11,7 +11,7 @@ usage() {
 TPOT TarPit Watcher installer
 
 Usage:
-  ./install.sh --deps        Install apt dependencies (conntrack, iproute2)
+  ./install.sh --deps        Install apt dependencies (conntrack)
   ./install.sh --install     Copy watcher into ~/tpotce and create ~/Tar-Start.sh
   ./install.sh --run         Run watcher now
   ./install.sh --all         deps + install + run
@@ -27,7 +27,7 @@ need_cmd() { command -v "$1" >/dev/null 2>&1; }
 install_deps() {
   echo "== Installing dependencies =="
   sudo apt-get update -y
-  sudo apt-get install -y conntrack iproute2
+  sudo apt-get install -y conntrack
   echo "OK"
 }
 
@@ -46,6 +46,7 @@ do_install() {
   echo ""
   echo "Stats will be saved to:"
   echo "  $HOME/.tarpit_watch_stats.json"
+  echo "  $HOME/.tarpit_watch_history.ndjson"
   echo "  $HOME/.tarpit_watch_snapshot.txt"
 }
 